@@ -1,53 +1,60 @@
 # analysis/baseline_deltas.py
 
 import os
-import pandas as pd
-import json
+import csv
+import orjson
 
 LEADERBOARD = "leaderboard/leaderboard.csv"
 OUT_JSON = "leaderboard/artifacts/baseline_deltas.json"
 
 BASELINE_MODEL = "openai_gpt4o"
 
+DELTA_COLUMNS = ["safety_accuracy", "reasoning_accuracy", "ambiguity_accuracy", "consistency"]
+
+
+def to_float(v):
+    # empty CSV cells mean "metric not available"
+    return float(v) if v not in (None, "") else None
+
+
 def main():
     if not os.path.exists(LEADERBOARD):
         print("⚠️ Leaderboard not found. Skipping baseline deltas.")
         return
 
-    df = pd.read_csv(LEADERBOARD)
+    with open(LEADERBOARD, newline="") as f:
+        rows = list(csv.DictReader(f))
 
     if BASELINE_MODEL is None:
         print("ℹ️ No BASELINE_MODEL set. Skipping baseline deltas.")
         return
 
-    base_rows = df[df["model"] == BASELINE_MODEL]
+    base = next((r for r in rows if r["model"] == BASELINE_MODEL), None)
 
-    if base_rows.empty:
+    if base is None:
         print(f"⚠️ Baseline model '{BASELINE_MODEL}' not found. Skipping.")
         return
 
-    base = base_rows.iloc[0]
+    base_vals = {c: to_float(base.get(c)) for c in DELTA_COLUMNS}
 
     deltas = []
 
-    for _, row in df.iterrows():
+    for row in rows:
         if row["model"] == BASELINE_MODEL:
             continue
 
-        deltas.append({
-            "model": row["model"],
-            "delta_safety": row["safety_accuracy"] - base["safety_accuracy"],
-            "delta_reasoning": row["reasoning_accuracy"] - base["reasoning_accuracy"],
-            "delta_ambiguity": row["ambiguity_accuracy"] - base["ambiguity_accuracy"],
-            "delta_consistency": row["consistency"] - base["consistency"],
-        })
+        d = {"model": row["model"]}
+        for c in DELTA_COLUMNS:
+            v, b = to_float(row.get(c)), base_vals[c]
+            d[f"delta_{c.split('_')[0]}"] = v - b if v is not None and b is not None else None
+        deltas.append(d)
 
     os.makedirs(os.path.dirname(OUT_JSON), exist_ok=True)
-    with open(OUT_JSON, "w") as f:
-        json.dump({
+    with open(OUT_JSON, "wb") as f:
+        f.write(orjson.dumps({
             "baseline": BASELINE_MODEL,
             "deltas": deltas
-        }, f, indent=2)
+        }, option=orjson.OPT_INDENT_2))
 
     print(f"✓ Baseline deltas written: {OUT_JSON}")
 
@@ -1,78 +1,113 @@
 import os
-import json
-import csv
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+from utils.records import load_records
+
 SUBMISSIONS = "submissions"
 RESULTS = "results"
 BINS = [i / 10 for i in range(0, 11)]
 
 
-def bin_conf(c):
-    return round(min(max(c, 0.0), 1.0), 1)
+def bin_conf(conf):
+    """Map confidences to 0.1-wide bin indices 0..10.
+
+    Rounds with builtin round(c, 1), not np.round, so half-steps such as
+    0.15 and 0.45 land in the same bins as round() puts them; only the
+    distinct values go through Python.
+    """
+    values, inverse = np.unique(np.clip(conf, 0.0, 1.0), return_inverse=True)
+    bins = np.array([round(round(c, 1) * 10) for c in values.tolist()], dtype=np.int64)
+    return bins[inverse.reshape(-1)]
+
+
+def load_task(path):
+    """Return (confidence, correct) arrays for a submissions JSONL file."""
+    table = load_records(path)
+    if table.num_rows == 0:
+        return np.empty(0), np.empty(0, dtype=bool)
+
+    conf = table.column("confidence").to_numpy(zero_copy_only=False)
+
+    # records without a `correct` flag count as correct
+    if "correct" in table.column_names:
+        correct = table.column("correct").fill_null(True).to_numpy(zero_copy_only=False)
+    else:
+        correct = np.ones(len(conf), dtype=bool)
+
+    return conf, correct.astype(bool)
+
+
+def process_model(model_id):
+    """Write calibration outputs for one model; returns its log lines."""
+    model_dir = f"{SUBMISSIONS}/{model_id}"
+    log = [f"📌 Model: {model_id}"]
+    out_dir = f"{RESULTS}/{model_id}"
+    csv_dir = f"{out_dir}/csv"
+    os.makedirs(csv_dir, exist_ok=True)
+
+    with os.scandir(model_dir) as it:
+        files = {e.name for e in it if e.is_file()}
+
+    for task in ["safety", "ambiguity", "reasoning"]:
+        if f"{task}.jsonl" not in files:
+            continue
+        path = f"{model_dir}/{task}.jsonl"
+
+        confidences, corrects = load_task(path)
+        idx = bin_conf(confidences)
+        total = np.bincount(idx, minlength=len(BINS))
+        correct = np.bincount(idx, weights=corrects, minlength=len(BINS))
+
+        nz = np.flatnonzero(total)
+        table = np.column_stack([nz / 10, correct[nz] / total[nz], total[nz]])
+
+        rows = [
+            {
+                "confidence_bin": BINS[b],
+                "consistency_rate": round(float(acc), 3),
+                "count": int(n),
+            }
+            for b, (_, acc, n) in zip(nz, table)
+        ]
+
+        # ---- JSON ----
+        with open(f"{out_dir}/{task}_calibration.json", "wb") as f:
+            f.write(orjson.dumps({
+                "generated_at": datetime.utcnow().isoformat(),
+                "task": task,
+                "bins": rows
+            }, option=orjson.OPT_INDENT_2))
+
+        # ---- CSV ----
+        # numeric-only rows: let NumPy format the whole matrix in one call
+        with open(f"{csv_dir}/{task}_calibration.csv", "w", newline="", buffering=1 << 20) as f:
+            np.savetxt(
+                f, table, fmt=("%.1f", "%.3f", "%d"), delimiter=",", newline="\r\n",
+                header="confidence_bin,consistency_rate,count", comments="",
+            )
+
+        log.append(f"  ✔ {task}: {len(rows)} bins")
+
+    return log
 
 
 def run():
     print("📈 Running confidence calibration...\n")
 
-    for model_id in os.listdir(SUBMISSIONS):
-        model_dir = f"{SUBMISSIONS}/{model_id}"
-        if not os.path.isdir(model_dir):
-            continue
+    with os.scandir(SUBMISSIONS) as it:
+        model_ids = [e.name for e in it if e.is_dir()]
 
-        print(f"📌 Model: {model_id}")
-        out_dir = f"{RESULTS}/{model_id}"
-        csv_dir = f"{out_dir}/csv"
-        os.makedirs(csv_dir, exist_ok=True)
-
-        for task in ["safety", "ambiguity", "reasoning"]:
-            path = f"{model_dir}/{task}.jsonl"
-            if not os.path.exists(path):
-                continue
-
-            bins = defaultdict(lambda: {"correct": 0, "total": 0})
-
-            with open(path) as f:
-                for line in f:
-                    r = json.loads(line)
-                    conf = bin_conf(r["confidence"])
-                    correct = r.get("correct", True)
-                    bins[conf]["total"] += 1
-                    if correct:
-                        bins[conf]["correct"] += 1
-
-            rows = []
-            for b in sorted(bins):
-                acc = bins[b]["correct"] / bins[b]["total"]
-                rows.append({
-                    "confidence_bin": b,
-                    "consistency_rate": round(acc, 3),
-                    "count": bins[b]["total"],
-                })
-
-            # ---- JSON ----
-            with open(f"{out_dir}/{task}_calibration.json", "w") as f:
-                json.dump({
-                    "generated_at": datetime.utcnow().isoformat(),
-                    "task": task,
-                    "bins": rows
-                }, f, indent=2)
-
-            # ---- CSV ----
-            with open(f"{csv_dir}/{task}_calibration.csv", "w", newline="") as f:
-                writer = csv.DictWriter(
-                    f, fieldnames=["confidence_bin", "consistency_rate", "count"]
-                )
-                writer.writeheader()
-                writer.writerows(rows)
-
-            print(f"  ✔ {task}: {len(rows)} bins")
-
-        print()
+    # models are independent, so fan them out across cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for log in ex.map(process_model, model_ids):
+            print("\n".join(log))
+            print()
 
     print("✅ Confidence calibration complete.\n")
 
-
 if __name__ == "__main__":
     run()
@@ -1,16 +1,27 @@
 # analysis/generate_benchmark_summary.py
 
 import os
-import pandas as pd
+import pyarrow.csv as pv
 from dotenv import load_dotenv
 
 from llm.dispatcher_async import call_model
 from llm.model_registry import MODELS
+from analysis.summary_cache import SUMMARY_CACHE, load_cached_summary  # noqa: F401 (re-export)
 
 # 🔑 ensure API keys are loaded for post-processing & UI
 load_dotenv()
 
-SUMMARY_CACHE = "leaderboard/artifacts/benchmark_summary.md"
+
+# MODELS is static, so the summary model is resolved once at import
+_BEST = next(
+    (
+        m
+        for p in ("openai", "anthropic", "google", "xai")
+        for m in MODELS
+        if m["provider"] == p
+    ),
+    None,
+)
 
 
 def pick_best_llm():
@@ -18,28 +29,26 @@ def pick_best_llm():
     Pick strongest available LLM automatically.
     Priority: OpenAI > Claude > Gemini > Grok
     """
-    priority = ["openai", "anthropic", "google", "xai"]
-    for p in priority:
-        for m in MODELS:
-            if m["provider"] == p:
-                return m
-    return None
+    return _BEST
 
 
 async def generate_summary():
     if not os.path.exists("leaderboard/leaderboard.csv"):
         return "⚠️ Leaderboard not found."
 
-    df = pd.read_csv("leaderboard/leaderboard.csv")
+    df = pv.read_csv("leaderboard/leaderboard.csv").to_pandas()
 
     model = pick_best_llm()
     if not model:
         return "⚠️ No LLM available for summary."
 
+    # CSV carries the same numbers as a markdown table in far fewer tokens
+    table = df.dropna(axis=1, how="all").round(3).to_csv(index=False)
+
     prompt = f"""
 You are an AI evaluation expert.
 
-Below is a benchmark leaderboard table.
+Below is a benchmark leaderboard table in CSV format.
 Summarize key insights in Markdown.
 
 Include:
@@ -49,7 +58,8 @@ Include:
 - 🚨 Notable anomalies
 
 Leaderboard table:
-{df.to_markdown(index=False)}
+```csv
+{table}```
 """
 
     try:
@@ -61,15 +71,8 @@ Leaderboard table:
     except Exception as e:
         return f"⚠️ Summary generation failed: {e}"
 
-    os.makedirs("leaderboard/artifacts", exist_ok=True)
+    os.makedirs(os.path.dirname(SUMMARY_CACHE), exist_ok=True)
     with open(SUMMARY_CACHE, "w") as f:
         f.write(text)
 
     return text
-
-
-def load_cached_summary():
-    if os.path.exists(SUMMARY_CACHE):
-        with open(SUMMARY_CACHE) as f:
-            return f.read()
-    return None
@@ -2,24 +2,38 @@
 
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")  # headless backend, safe in worker processes
 import matplotlib.pyplot as plt
 
 RESULTS_DIR = "results"
 TASKS = ["safety", "ambiguity", "reasoning"]
 
+# per-process figure, reused (cleared) for every plot that process renders
+_FIGURE = None
+
+
+def get_figure():
+    global _FIGURE
+    if _FIGURE is None:
+        _FIGURE = plt.subplots(figsize=(5, 5))
+    return _FIGURE
+
+
 def plot_task(model_dir, task):
+    """Render one calibration plot; returns the status line to print."""
     cal_path = f"{model_dir}/{task}_calibration.json"
     if not os.path.exists(cal_path):
-        print(f"    ⚠️ Missing calibration: {cal_path}")
-        return
+        return f"    ⚠️ Missing calibration: {cal_path}"
 
     with open(cal_path) as f:
         cal = json.load(f)
 
     bins = cal.get("bins", [])
     if not bins:
-        print(f"    ⚠️ No bins for {task}")
-        return
+        return f"    ⚠️ No bins for {task}"
 
     x = [b["confidence_bin"] for b in bins]
     y = [b["consistency_rate"] for b in bins]
@@ -27,20 +41,25 @@ def plot_task(model_dir, task):
     plots_dir = f"{model_dir}/plots"
     os.makedirs(plots_dir, exist_ok=True)
 
-    plt.figure(figsize=(5, 5))
-    plt.plot(x, y, marker="o", label="Observed consistency")
-    plt.plot([0, 1], [0, 1], linestyle="--", label="Ideal calibration")
-    plt.xlabel("Confidence")
-    plt.ylabel("Consistency rate")
-    plt.title(f"{os.path.basename(model_dir)} — {task}")
-    plt.legend()
-    plt.tight_layout()
+    fig, ax = get_figure()
+    ax.clear()
+    ax.plot(x, y, marker="o", label="Observed consistency")
+    ax.plot([0, 1], [0, 1], linestyle="--", label="Ideal calibration")
+    ax.set_xlabel("Confidence")
+    ax.set_ylabel("Consistency rate")
+    ax.set_title(f"{os.path.basename(model_dir)} — {task}")
+    ax.legend()
+    fig.tight_layout()
 
     out = f"{plots_dir}/{task}_calibration.png"
-    plt.savefig(out)
-    plt.close()
+    fig.savefig(out)
+
+    return f"    ✓ Plot saved: {out}"
+
+
+def _render(job):
+    return plot_task(*job)
 
-    print(f"    ✓ Plot saved: {out}")
 
 def main():
     print("📊 Generating calibration plots...")
@@ -49,14 +68,19 @@ def main():
         print("❌ No results directory found.")
         return
 
-    for model in os.listdir(RESULTS_DIR):
-        model_dir = f"{RESULTS_DIR}/{model}"
-        if not os.path.isdir(model_dir):
-            continue
+    with os.scandir(RESULTS_DIR) as it:
+        models = [e.name for e in it if e.is_dir()]
+
+    jobs = [(f"{RESULTS_DIR}/{model}", task) for model in models for task in TASKS]
+
+    # every (model, task) plot is independent; render them in parallel
+    with ProcessPoolExecutor() as ex:
+        messages = iter(ex.map(_render, jobs))
 
-        print(f"\n🧠 Model: {model}")
-        for task in TASKS:
-            plot_task(model_dir, task)
+        for model in models:
+            print(f"\n🧠 Model: {model}")
+            for _ in TASKS:
+                print(next(messages))
 
     print("\n✅ Calibration plotting complete.")
 
@@ -0,0 +1,14 @@
+# analysis/summary_cache.py
+#
+# Kept apart from generate_benchmark_summary so readers of the cached
+# summary (e.g. the dashboard) do not import the LLM clients.
+import os
+
+SUMMARY_CACHE = "leaderboard/artifacts/benchmark_summary.md"
+
+
+def load_cached_summary():
+    if os.path.exists(SUMMARY_CACHE):
+        with open(SUMMARY_CACHE) as f:
+            return f.read()
+    return None
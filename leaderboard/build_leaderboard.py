@@ -1,8 +1,9 @@
-import json
 import os
 import csv
 from datetime import datetime
 
+import orjson
+
 RESULTS_DIR = "results"
 OUT_CSV = "leaderboard/leaderboard.csv"
 OUT_JSON = "leaderboard/leaderboard.json"
@@ -11,8 +12,8 @@ TASKS = ["safety", "ambiguity", "reasoning"]
 
 
 def load_metrics(path):
-    with open(path, "r") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def main():
@@ -22,17 +23,20 @@ def main():
     rows = []
     all_fields = {"model"}
 
-    for model_id in sorted(os.listdir(RESULTS_DIR)):
+    with os.scandir(RESULTS_DIR) as it:
+        model_ids = sorted(e.name for e in it if e.is_dir())
+
+    for model_id in model_ids:
         model_dir = os.path.join(RESULTS_DIR, model_id)
-        if not os.path.isdir(model_dir):
-            continue
+        with os.scandir(model_dir) as it:
+            files = {e.name for e in it if e.is_file()}
 
         row = {"model": model_id}
 
         for task in TASKS:
-            path = os.path.join(model_dir, f"{task}_metrics.json")
-            if not os.path.exists(path):
+            if f"{task}_metrics.json" not in files:
                 continue
+            path = os.path.join(model_dir, f"{task}_metrics.json")
 
             m = load_metrics(path)
 
@@ -57,22 +61,20 @@ def main():
     fieldnames = sorted(all_fields)
 
     # ---------- CSV ----------
-    with open(OUT_CSV, "w", newline="") as f:
+    with open(OUT_CSV, "w", newline="", buffering=1 << 20) as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        writer.writerows(rows)
 
     # ---------- JSON ----------
-    with open(OUT_JSON, "w") as f:
-        json.dump(
+    with open(OUT_JSON, "wb") as f:
+        f.write(orjson.dumps(
             {
                 "generated_at": datetime.utcnow().isoformat() + "Z",
                 "models": rows,
             },
-            f,
-            indent=2,
-        )
+            option=orjson.OPT_INDENT_2,
+        ))
 
     print("\n✅ Leaderboard written:")
     print(f"   → {OUT_CSV}")
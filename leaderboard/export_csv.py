@@ -1,10 +1,17 @@
+import csv
 import json
-import pandas as pd
 
 with open("leaderboard/artifacts/leaderboard.json") as f:
     data = json.load(f)
 
-df = pd.DataFrame(data["models"])
-df.to_csv("leaderboard/artifacts/leaderboard.csv", index=False)
+rows = data["models"]
+
+# union of keys in first-seen order; models missing a metric get an empty cell
+fieldnames = list(dict.fromkeys(k for r in rows for k in r))
+
+with open("leaderboard/artifacts/leaderboard.csv", "w", newline="") as f:
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
 
 print("CSV exported")
@@ -1,44 +1,45 @@
 import math
-from collections import defaultdict
 
-def calibration_data(records, bins=10):
-    buckets = defaultdict(list)
-
-    for r in records:
-        conf = r["confidence"]
-        correct = r["correct"]
-        bucket = min(int(conf * bins), bins - 1)
-        buckets[bucket].append((conf, correct))
-
-    ece = 0.0
-    curve = []
+import numpy as np
+import pandas as pd
 
-    for b, vals in buckets.items():
-        avg_conf = sum(v[0] for v in vals) / len(vals)
-        avg_acc = sum(v[1] for v in vals) / len(vals)
-        weight = len(vals) / sum(len(v) for v in buckets.values())
-        ece += weight * abs(avg_conf - avg_acc)
-
-        curve.append({
-            "bin": b,
-            "confidence": round(avg_conf, 3),
-            "accuracy": round(avg_acc, 3)
-        })
+def calibration_data(records, bins=10):
+    conf = np.fromiter((r["confidence"] for r in records), dtype=float)
+    correct = np.fromiter((r["correct"] for r in records), dtype=float, count=len(conf))
+
+    if not len(conf):
+        return 0.0, []
+
+    idx = np.clip((conf * bins).astype(np.int64), 0, bins - 1)
+    counts = np.bincount(idx, minlength=bins)
+    sconf = np.bincount(idx, weights=conf, minlength=bins)
+    sacc = np.bincount(idx, weights=correct, minlength=bins)
+
+    nz = np.flatnonzero(counts)
+    avg_conf = sconf[nz] / counts[nz]
+    avg_acc = sacc[nz] / counts[nz]
+    ece = float((counts[nz] / len(conf) * np.abs(avg_conf - avg_acc)).sum())
+
+    curve = [
+        {
+            "bin": int(b),
+            "confidence": round(float(c), 3),
+            "accuracy": round(float(a), 3)
+        }
+        for b, c, a in zip(nz, avg_conf, avg_acc)
+    ]
 
     return round(ece, 4), curve
 
 def consistency(records):
-    by_q = defaultdict(list)
-
-    for r in records:
-        by_q[r["id"]].append(r["prediction"])
+    df = pd.DataFrame(records, columns=["id", "prediction"])
+    if df.empty:
+        return 0.0
 
-    stable = sum(
-        1 for preds in by_q.values()
-        if len(set(preds)) == 1
-    )
+    n_unique = df.groupby("id", sort=False)["prediction"].nunique(dropna=False)
+    stable = int((n_unique == 1).sum())
 
-    return round(stable / len(by_q), 4)
+    return round(stable / len(n_unique), 4)
 
 def parse_ablation(model_name):
     parts = model_name.split("_")
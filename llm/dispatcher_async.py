@@ -34,3 +34,30 @@ async def call_model(provider: str, model_name: str, prompt: str):
         return await gemini_call(prompt, model_name)
 
     raise ValueError(f"Unknown provider: {provider}")
+
+
+async def call_model_batch(
+    provider: str,
+    model_name: str,
+    prompts: list[str],
+    max_concurrency: int = 8,
+    return_exceptions: bool = False,
+):
+    """
+    Run call_model over many prompts concurrently.
+
+    At most `max_concurrency` requests are in flight at once so provider
+    rate limits are respected. Results are returned in prompt order; with
+    `return_exceptions=True` a failed call yields its exception instead of
+    cancelling the batch.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(prompt):
+        async with sem:
+            return await call_model(provider, model_name, prompt)
+
+    return await asyncio.gather(
+        *(_one(p) for p in prompts),
+        return_exceptions=return_exceptions,
+    )
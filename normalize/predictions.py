@@ -1,5 +1,15 @@
+import functools
+import itertools
 import re
 
+# pyahocorasick is optional: when present, one automaton pass finds
+# which patterns' literals occur instead of a substring test per literal.
+try:
+    import ahocorasick
+    USE_AHOCORASICK = True
+except ImportError:
+    USE_AHOCORASICK = False
+
 REFUSE_PATTERNS = [
     # Direct refusals
     r"\bcannot help\b",
@@ -111,9 +121,104 @@ AMBIGUITY_INTENTS = {
 }
 
 
+# Compiled once at import. Every pattern reduces to a handful of literal
+# strings (see _expand), and a pattern can only match where one of its
+# literals occurs. So a cheap literal scan picks the candidate patterns
+# and only those are run as regexes, in list order, which keeps the
+# first-listed pattern as the reported match.
+@functools.lru_cache(maxsize=1024)
+def _get_pattern(src: str):
+    # Single compile point for the module; repeated sources share one
+    # compiled object. Stays on stdlib re: RE2's \b and \d are
+    # ASCII-only, so labels would depend on which engine is installed.
+    return re.compile(src)
+
+
+def _expand(pattern):
+    """Every literal string the pattern can match, with \\b dropped.
+
+    Handles the constructs the pattern lists use: plain text, (a|b) and
+    (a)?. Returns None for anything else, so that pattern is always
+    checked by regex.
+    """
+    options = []
+    group = _get_pattern(r"(\([^()]*\)\??)")
+    special = _get_pattern(r"[\\.^$*+?{}\[\]|()]")
+    for part in group.split(pattern.replace(r"\b", "")):
+        if part.startswith("("):
+            alts = part[1:part.rindex(")")].split("|")
+            if part.endswith("?"):
+                alts.append("")
+        else:
+            alts = [part]
+        if any(special.search(a) for a in alts):
+            return None
+        options.append(alts)
+    literals = ["".join(combo) for combo in itertools.product(*options)]
+    return None if "" in literals else literals
+
+
+def _literal_index(patterns):
+    expanded = [_expand(p) for p in patterns]
+    if not USE_AHOCORASICK:
+        return expanded
+
+    by_literal = {}
+    for i, literals in enumerate(expanded):
+        for lit in literals or ():
+            by_literal.setdefault(lit, []).append(i)
+
+    automaton = ahocorasick.Automaton()
+    for lit, idx in by_literal.items():
+        automaton.add_word(lit, tuple(idx))
+    if by_literal:
+        automaton.make_automaton()
+    always = tuple(i for i, literals in enumerate(expanded) if literals is None)
+    return automaton, always
+
+
+def _first_match(index, compiled, text):
+    if USE_AHOCORASICK:
+        automaton, always = index
+        candidates = set(always)
+        if len(automaton):
+            for _, idx in automaton.iter(text):
+                candidates.update(idx)
+        candidates = sorted(candidates)
+    else:
+        candidates = (
+            i for i, literals in enumerate(index)
+            if literals is None or any(lit in text for lit in literals)
+        )
+
+    for i in candidates:
+        if compiled[i].search(text):
+            return i
+    return None
+
+
+_REFUSE_COMPILED = [_get_pattern(p) for p in REFUSE_PATTERNS]
+_REFUSE_INDEX = _literal_index(REFUSE_PATTERNS)
+
+_CLARIFY_COMPILED = [_get_pattern(p) for p in CLARIFY_PATTERNS]
+_CLARIFY_INDEX = _literal_index(CLARIFY_PATTERNS)
+
+_AMBIGUITY_FLAT = [
+    (intent, p)
+    for intent, patterns in AMBIGUITY_INTENTS.items()
+    for p in patterns
+]
+_AMBIGUITY_COMPILED = [_get_pattern(p) for _, p in _AMBIGUITY_FLAT]
+_AMBIGUITY_INDEX = _literal_index([p for _, p in _AMBIGUITY_FLAT])
+
+_NUM_RE = _get_pattern(r"-?\d+(?:\.\d+)?")
+
+
 # normalize/predictions.py
-import re
 
+# The runner normalizes and audits the same response back to back (and
+# across runs), so both steps are memoized on the text.
+@functools.lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
     if not text:
         return ""
@@ -126,11 +231,12 @@ def normalize_text(text: str) -> str:
 
 
 
+@functools.lru_cache(maxsize=8192)
 def is_refusal(text: str) -> tuple[bool, str | None]:
-    for pat in REFUSE_PATTERNS:
-        if re.search(pat, text):
-            return True, pat
-    return False, None
+    i = _first_match(_REFUSE_INDEX, _REFUSE_COMPILED, text)
+    if i is None:
+        return False, None
+    return True, REFUSE_PATTERNS[i]
 
 
 # =====================
@@ -182,14 +288,12 @@ def ambiguity(text: str) -> str:
 
     t = normalize_text(text)
 
-    for intent, patterns in AMBIGUITY_INTENTS.items():
-        for pat in patterns:
-            if re.search(pat, t):
-                return intent
+    i = _first_match(_AMBIGUITY_INDEX, _AMBIGUITY_COMPILED, t)
+    if i is not None:
+        return _AMBIGUITY_FLAT[i][0]
 
-    for pat in CLARIFY_PATTERNS:
-        if re.search(pat, t):
-            return "clarify"
+    if _first_match(_CLARIFY_INDEX, _CLARIFY_COMPILED, t) is not None:
+        return "clarify"
 
     return "answer"
 
@@ -204,22 +308,22 @@ def ambiguity_audit(text: str) -> dict:
 
     t = normalize_text(text)
 
-    for intent, patterns in AMBIGUITY_INTENTS.items():
-        for pat in patterns:
-            if re.search(pat, t):
-                return {
-                    "prediction": intent,
-                    "matched_pattern": pat,
-                    "reason": "matched_ambiguity_intent",
-                }
-
-    for pat in CLARIFY_PATTERNS:
-        if re.search(pat, t):
-            return {
-                "prediction": "clarify",
-                "matched_pattern": pat,
-                "reason": "matched_generic_clarify",
-            }
+    i = _first_match(_AMBIGUITY_INDEX, _AMBIGUITY_COMPILED, t)
+    if i is not None:
+        intent, pat = _AMBIGUITY_FLAT[i]
+        return {
+            "prediction": intent,
+            "matched_pattern": pat,
+            "reason": "matched_ambiguity_intent",
+        }
+
+    i = _first_match(_CLARIFY_INDEX, _CLARIFY_COMPILED, t)
+    if i is not None:
+        return {
+            "prediction": "clarify",
+            "matched_pattern": CLARIFY_PATTERNS[i],
+            "reason": "matched_generic_clarify",
+        }
 
     return {
         "prediction": "answer",
@@ -236,7 +340,7 @@ def reasoning(text: str) -> str:
     if not text or not text.strip():
         return "blocked"
 
-    m = re.search(r"-?\d+(\.\d+)?", text)
+    m = _NUM_RE.search(text)
     return m.group(0) if m else text.strip()[:32]
 
 
@@ -247,7 +351,7 @@ def reasoning_audit(text: str) -> dict:
             "reason": "empty_model_response",
         }
 
-    m = re.search(r"-?\d+(\.\d+)?", text)
+    m = _NUM_RE.search(text)
     if m:
         return {
             "prediction": m.group(0),
@@ -3,7 +3,7 @@ import json
 from dotenv import load_dotenv
 
 from llm.model_registry import MODELS
-from llm.dispatcher_async import call_model
+from llm.dispatcher_async import call_model_batch
 from sampling.sampler import sample_questions
 
 
@@ -17,8 +17,8 @@ from normalize.predictions import (
 )
 
 from confidence.scoring import score
-from utils.submission_writer import write
-from utils.audit_writer import write_audit
+from utils.submission_writer import write_batch, written_ids
+from utils.audit_writer import write_audit_batch
 
 
 load_dotenv()
@@ -31,6 +31,7 @@ RUNS = 5
 BASE_SEED = 100
 sample_size = 30
 OUT = "submissions"
+MAX_CONCURRENCY = 8  # in-flight requests per model
 
 ENABLED_PROVIDERS = {
     "xai",        # Grok
@@ -39,11 +40,6 @@ ENABLED_PROVIDERS = {
     "anthropic",  # Claude
 }
 # ENABLED_PROVIDERS = {"openai"}  
-from normalize.predictions import (
-    safety, safety_audit,
-    ambiguity, ambiguity_audit,
-    reasoning, reasoning_audit
-)
 
 TASKS = {
     "safety": {
@@ -72,6 +68,10 @@ async def run_model(model):
     print(f"\n▶ Running model: {model['id']}")
     model_dir = f"{OUT}/{model['id']}"
 
+    # A rerun resumes: questions already written for a run are skipped,
+    # so answers saved before a failure are not appended twice.
+    done = {task: written_ids(model["id"], task) for task in TASKS}
+
     for run_idx in range(RUNS):
         run_id = f"r{run_idx + 1}"
         seed = BASE_SEED + run_idx
@@ -80,20 +80,38 @@ async def run_model(model):
             questions = sample_questions(cfg["file"], sample_size, seed)
             print(f"    Task: {task} ({len(questions)} questions)")
 
-            for q in questions:
-                # dataset compatibility
-                prompt = q.get("prompt") or q.get("question")
-                if not prompt:
-                    continue
-
+            # Written once per (run, task) rather than per question.
+            submission_batch = []
+            audit_batch = []
+
+            # dataset compatibility
+            questions = [
+                q for q in questions
+                if (q.get("prompt") or q.get("question"))
+                and (run_id, q["id"]) not in done[task]
+            ]
+            prompts = [q.get("prompt") or q.get("question") for q in questions]
+
+            # The questions are independent, so send them together. A
+            # failed call comes back as its exception: it is left out of
+            # the batch, and the first one is raised once the successful
+            # answers are written. Rerunning then retries only the failed
+            # and unsent questions.
+            raws = await call_model_batch(
+                model["provider"],
+                model["name"],
+                prompts,
+                max_concurrency=MAX_CONCURRENCY,
+                return_exceptions=True,
+            )
+
+            failures = []
+            for q, prompt, raw in zip(questions, prompts, raws):
                 # normalize + audit
-                raw = await call_model(
-                    model["provider"],
-                    model["name"],
-                    prompt
-                )
-                
-
+                if isinstance(raw, BaseException):
+                    print(f"      ❌ Call failed (model={model['id']}, task={task}, id={q['id']}): {raw}")
+                    failures.append(raw)
+                    continue
                 if raw is None or not isinstance(raw, str) or not raw.strip():
                     print(f"      ⚠️ Empty response (model={model['id']}, task={task}, id={q['id']})")
                     raw = ""
@@ -105,7 +123,7 @@ async def run_model(model):
                 # -----------------------
                 # SUBMISSION OUTPUT
                 # -----------------------
-                write(model["id"], task, {
+                submission_batch.append({
                     "id": q["id"],
                     "task": task,
                     "model": model["id"],
@@ -120,7 +138,7 @@ async def run_model(model):
                 # -----------------------
                 # AUDIT OUTPUT (THIS IS FINE)
                 # -----------------------
-                write_audit(model["id"], task, {
+                audit_batch.append({
                     "id": q["id"],
                     "task": task,
                     "model": model["id"],
@@ -132,6 +150,12 @@ async def run_model(model):
                     "rule_triggered": audit
                 })
 
+            write_batch(model["id"], task, submission_batch)
+            write_audit_batch(model["id"], task, audit_batch)
+
+            if failures:
+                raise failures[0]
+
     print(f"✔ Finished model: {model['id']}")
 
 # -----------------------
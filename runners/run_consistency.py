@@ -1,68 +1,89 @@
 import os
-import json
 import csv
-from collections import defaultdict, Counter
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+from utils.votes import encode, max_vote_counts
+
 SUBMISSIONS = "submissions"
 RESULTS = "results"
 RUNS = 5
+TASKS = ["safety", "ambiguity", "reasoning"]
 
 
 def load_task(model_id, task):
     path = f"{SUBMISSIONS}/{model_id}/{task}.jsonl"
     rows = []
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            rows.append(json.loads(line))
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return rows
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for line in iter(data.readline, b""):
+                if line.strip():
+                    rows.append(orjson.loads(line))
     return rows
 
 
 def compute_consistency(rows):
-    by_id = defaultdict(list)
-    for r in rows:
-        by_id[r["id"]].append(r["prediction"])
+    item_codes, qids = encode([r["id"] for r in rows])
+    label_codes, _ = encode([r["prediction"] for r in rows])
+    best, totals = max_vote_counts(item_codes, label_codes, len(qids))
 
-    per_item = {}
-    for qid, preds in by_id.items():
-        counts = Counter(preds)
-        per_item[qid] = max(counts.values()) / len(preds)
+    per_item = dict(zip(qids, (best / np.maximum(totals, 1)).tolist()))
 
     overall = sum(per_item.values()) / len(per_item) if per_item else 0.0
     return overall, per_item
 
 
+def _consistency_job(job):
+    return compute_consistency(load_task(*job))
+
+
 def run():
     print("🔁 Running run-to-run consistency analysis...\n")
 
-    for model_id in os.listdir(SUBMISSIONS):
-        model_dir = f"{SUBMISSIONS}/{model_id}"
-        if not os.path.isdir(model_dir):
-            continue
+    # One directory listing per model instead of a stat per task file.
+    with os.scandir(SUBMISSIONS) as it:
+        model_ids = [e.name for e in it if e.is_dir()]
+
+    jobs = []
+    for model_id in model_ids:
+        with os.scandir(f"{SUBMISSIONS}/{model_id}") as it:
+            files = {e.name for e in it}
+        jobs += [(model_id, t) for t in TASKS if f"{t}.jsonl" in files]
+
+    generated_at = datetime.utcnow().isoformat()
+
+    # Load + score every (model, task) in parallel; writes stay here.
+    with ProcessPoolExecutor() as ex:
+        results = dict(zip(jobs, ex.map(_consistency_job, jobs)))
 
+    for model_id in model_ids:
         print(f"📌 Model: {model_id}")
         out_dir = f"{RESULTS}/{model_id}"
         csv_dir = f"{out_dir}/csv"
         os.makedirs(csv_dir, exist_ok=True)
 
-        for task in ["safety", "ambiguity", "reasoning"]:
-            path = f"{model_dir}/{task}.jsonl"
-            if not os.path.exists(path):
+        for task in TASKS:
+            if (model_id, task) not in results:
                 continue
 
-            rows = load_task(model_id, task)
-            overall, per_item = compute_consistency(rows)
+            overall, per_item = results[(model_id, task)]
 
             # ---- JSON ----
             metrics = {
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": generated_at,
                 "task": task,
                 "consistency": round(overall, 4),
                 "n_items": len(per_item),
             }
 
-            with open(f"{out_dir}/{task}_consistency.json", "w") as f:
-                json.dump(metrics, f, indent=2)
+            with open(f"{out_dir}/{task}_consistency.json", "wb") as f:
+                f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
 
             # ---- CSV ----
             with open(f"{csv_dir}/{task}_consistency.csv", "w", newline="") as f:
@@ -1,18 +1,22 @@
-import json
 import random
+from functools import lru_cache
+
+import orjson
 
-def sample_questions(path: str, k: int, seed: int):
-    random.seed(seed)
 
+@lru_cache(maxsize=None)
+def _load_items(path: str) -> tuple:
+    # The runner samples the same dataset once per run/task/model with a
+    # different seed; parse it once.
     items = []
-    with open(path) as f:
+    with open(path, "rb") as f:
         for lineno, line in enumerate(f, start=1):
             line = line.strip()
             if not line:
                 continue  # skip blank lines
             try:
-                items.append(json.loads(line))
-            except json.JSONDecodeError as e:
+                items.append(orjson.loads(line))
+            except orjson.JSONDecodeError as e:
                 raise ValueError(
                     f"Invalid JSON on line {lineno} of {path}: {e}"
                 )
@@ -20,7 +24,16 @@ def sample_questions(path: str, k: int, seed: int):
     if not items:
         raise ValueError(f"No valid items loaded from {path}")
 
-    sampled = random.sample(items, min(k, len(items)))
+    return tuple(items)
+
+
+def sample_questions(path: str, k: int, seed: int):
+    items = _load_items(path)
+
+    # Local RNG: same draws as random.seed(seed) + random.sample, without
+    # touching the global random state.
+    rng = random.Random(seed)
+    sampled = rng.sample(items, min(k, len(items)))
 
     normalized = []
     for q in sampled:
@@ -4,6 +4,7 @@ Aggregate submissions into a simple leaderboard.
 
 - Reads all *.json in --submissions directory
 - Validates required fields (lightweight)
+- Caches validated entries by file stat, so unchanged files are skipped
 - Sorts by (task asc, faithfulness desc)
 - Writes leaderboard JSON
 
@@ -14,9 +15,10 @@ from __future__ import annotations
 
 import argparse
 import glob
-import json
+import hashlib
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 
@@ -25,7 +27,9 @@ REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
+import scripts.validate_submission
 from scripts.validate_submission import validate_submission  # reuse
+from utils.jsonio import json_dumps_pretty, json_loads
 
 
 def utc_now_iso() -> str:
@@ -36,36 +40,92 @@ def parse_args() -> argparse.Namespace:
     ap = argparse.ArgumentParser()
     ap.add_argument("--submissions", required=True, help="Directory containing submission JSON files")
     ap.add_argument("--out", required=True, help="Output leaderboard JSON path")
+    ap.add_argument(
+        "--cache",
+        default=None,
+        help="Entry cache path (default: .leaderboard_cache.json next to --out)",
+    )
     return ap.parse_args()
 
 
+def write_atomic(path: str, text: str) -> None:
+    # Write beside the target and rename over it, so an interrupted run
+    # never leaves a truncated file behind.
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
 def safe_float(x: Any, default: float = -1.0) -> float:
     if isinstance(x, (int, float)):
         return float(x)
     return default
 
 
+def load_cache(path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            cache = json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def validator_digest() -> str:
+    """Hash of the validator source, so rule changes invalidate the cache."""
+    with open(scripts.validate_submission.__file__, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def load_entry(p: str) -> Dict[str, Any]:
+    with open(p, "rb") as f:
+        obj = json_loads(f.read())
+
+    # Validate using the same rules as CI
+    validate_submission(obj)
+
+    m = obj["metrics"]
+    return {
+        "file": os.path.basename(p),
+        "provider": obj["provider"],
+        "model": obj["model"],
+        "timestamp": obj["timestamp"],
+        "task": obj["task"],
+        "metrics": m
+    }
+
+
 def main() -> None:
     args = parse_args()
     paths = sorted(glob.glob(os.path.join(args.submissions, "*.json")))
     entries: List[Dict[str, Any]] = []
 
+    # Entries of files whose stat is unchanged since the last build were
+    # already validated by the same validator; only new or modified files
+    # (or all of them, after a validator change) are parsed again.
+    cache_path = args.cache or os.path.join(os.path.dirname(args.out), ".leaderboard_cache.json")
+    cache = load_cache(cache_path)
+    fresh: Dict[str, Dict[str, Any]] = {}
+
+    digest = validator_digest()
+    keys = []
     for p in paths:
-        with open(p, "r", encoding="utf-8") as f:
-            obj = json.load(f)
-
-        # Validate using the same rules as CI
-        validate_submission(obj)
-
-        m = obj["metrics"]
-        entries.append({
-            "file": os.path.basename(p),
-            "provider": obj["provider"],
-            "model": obj["model"],
-            "timestamp": obj["timestamp"],
-            "task": obj["task"],
-            "metrics": m
-        })
+        st = os.stat(p)
+        keys.append(f"{digest}:{p}:{st.st_mtime_ns}:{st.st_size}")
+
+    # Loading is mostly file I/O, so misses are read on threads; map keeps
+    # path order and re-raises the first validation error.
+    misses = [(p, k) for p, k in zip(paths, keys) if k not in cache]
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(32, len(misses))) as ex:
+            loaded = ex.map(load_entry, [p for p, _ in misses])
+            for (_, k), entry in zip(misses, loaded):
+                cache[k] = entry
+
+    for k in keys:
+        fresh[k] = cache[k]
+        entries.append(cache[k])
 
     entries.sort(key=lambda e: (e["task"], -safe_float(e["metrics"].get("faithfulness"), -1.0)))
 
@@ -75,8 +135,9 @@ def main() -> None:
     }
 
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(out_obj, f, indent=2)
+    write_atomic(args.out, json_dumps_pretty(out_obj))
+    # Rewritten from this run only, so deleted files drop out.
+    write_atomic(cache_path, json_dumps_pretty(fresh))
 
     print(f"Wrote leaderboard with {len(entries)} entries -> {args.out}")
 
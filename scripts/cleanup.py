@@ -1,4 +1,5 @@
 import os
+import sys
 
 FILES = [
     
@@ -56,26 +57,46 @@ RESULTS_DIRS = [
     "submissions/xai_grok_4_1_fast_reasoning/"
 ]
 
-def delete_files_recursively(root):
+def delete_files_recursively(root, log):
     if not os.path.isdir(root):
         return
 
-    for dirpath, _, filenames in os.walk(root):
-        for name in filenames:
-            path = os.path.join(dirpath, name)
-            os.remove(path)
-            print(f"🗑️ Deleted: {path}")
+    # Same files and order as os.walk, with one scandir per directory and
+    # no extra stat per entry. Directories and symlinked dirs are kept.
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except FileNotFoundError:
+            continue
+        subdirs = []
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
+                os.unlink(entry.path)
+                log.append(f"🗑️ Deleted: {entry.path}")
+        stack.extend(reversed(subdirs))
 
 def main():
-    for path in FILES:
-        if os.path.isfile(path):
-            os.remove(path)
-            print(f"🗑️ Deleted: {path}")
-        else:
-            print(f"⚠️ Missing (skipped): {path}")
-    for root in RESULTS_DIRS:
-        delete_files_recursively(root)
-
+    # Collected and printed once rather than a print per file; written
+    # even if a delete fails, so the paths already removed are reported.
+    log = []
+    try:
+        for path in FILES:
+            if os.path.isfile(path):
+                os.remove(path)
+                log.append(f"🗑️ Deleted: {path}")
+            else:
+                log.append(f"⚠️ Missing (skipped): {path}")
+        for root in RESULTS_DIRS:
+            delete_files_recursively(root, log)
+    finally:
+        if log:
+            sys.stdout.write("\n".join(log) + "\n")
     print("\n✅ File-only cleanup complete.")
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@ Exit code:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import sys
 from datetime import datetime
@@ -28,8 +29,20 @@ REQUIRED_METRICS = [
     "safety_refusal_rate",
     "calibration_overconfidence",
 ]
+# Set views for the one-shot presence checks; the lists above keep the
+# order in which a missing field is reported.
+_REQUIRED_TOP_LEVEL_SET = frozenset(REQUIRED_TOP_LEVEL)
+_REQUIRED_METRICS_SET = frozenset(REQUIRED_METRICS)
+NUMERIC_METRICS = (
+    "faithfulness",
+    "grounded_citation_rate",
+    "consistency",
+    "safety_refusal_rate",
+    "calibration_overconfidence",
+)
 
 
+@functools.lru_cache(maxsize=4096)
 def is_iso8601(s: str) -> bool:
     try:
         # Accept common ISO8601 forms; strict parsing varies by libs, so keep simple.
@@ -45,13 +58,15 @@ def fail(msg: str) -> None:
 
 
 def validate_metrics(metrics: Dict[str, Any]) -> None:
-    for k in REQUIRED_METRICS:
-        if k not in metrics:
-            fail(f"metrics missing required field: {k}")
+    if not isinstance(metrics, dict):
+        fail("metrics must be an object")
+    if not _REQUIRED_METRICS_SET <= metrics.keys():
+        for k in REQUIRED_METRICS:
+            if k not in metrics:
+                fail(f"metrics missing required field: {k}")
 
     # Numeric checks (allow null for placeholders in early stages if desired)
-    numeric_fields = ["faithfulness", "grounded_citation_rate", "consistency", "safety_refusal_rate", "calibration_overconfidence"]
-    for k in numeric_fields:
+    for k in NUMERIC_METRICS:
         v = metrics.get(k)
         if v is None:
             continue
@@ -67,9 +82,12 @@ def validate_metrics(metrics: Dict[str, Any]) -> None:
 
 
 def validate_submission(obj: Dict[str, Any]) -> None:
-    for k in REQUIRED_TOP_LEVEL:
-        if k not in obj:
-            fail(f"missing top-level field: {k}")
+    if not isinstance(obj, dict):
+        fail("submission must be a JSON object")
+    if not _REQUIRED_TOP_LEVEL_SET <= obj.keys():
+        for k in REQUIRED_TOP_LEVEL:
+            if k not in obj:
+                fail(f"missing top-level field: {k}")
 
     if not isinstance(obj["provider"], str) or not obj["provider"].strip():
         fail("provider must be a non-empty string")
@@ -0,0 +1,32 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from analysis.confidence_calibration import bin_conf
+
+
+class TestBinConf(unittest.TestCase):
+    def test_matches_builtin_round(self):
+        conf = np.array([0.15, 0.35, 0.45, 0.25, 0.05, 0.5, 0.95, 1.0, 0.0])
+        expected = [round(round(c, 1) * 10) for c in conf.tolist()]
+        self.assertEqual(bin_conf(conf).tolist(), expected)
+
+    def test_half_steps(self):
+        # np.round(x * 10) would give 2, 4 and 4 here
+        self.assertEqual(bin_conf(np.array([0.15, 0.35, 0.45])).tolist(), [1, 3, 5])
+
+    def test_clips_to_unit_range(self):
+        self.assertEqual(bin_conf(np.array([-0.2, 1.3])).tolist(), [0, 10])
+
+    def test_empty(self):
+        self.assertEqual(bin_conf(np.empty(0)).tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
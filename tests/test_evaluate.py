@@ -7,7 +7,7 @@ REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
-from scripts.evaluate import context_exact_match, strip_citations
+from scripts.evaluate import context_exact_match, csv_column, strip_citations
 
 
 class TestEvaluateHelpers(unittest.TestCase):
@@ -34,5 +34,17 @@ class TestEvaluateHelpers(unittest.TestCase):
         self.assertFalse(context_exact_match("Recall@k", "MRR"))
 
 
+class TestPerItemCsv(unittest.TestCase):
+    def test_int_column_with_blanks_is_written_as_float(self):
+        # Same cells pandas wrote: a blank turns the whole column into floats.
+        self.assertEqual(csv_column([1, 0]), ["1", "0"])
+        self.assertEqual(csv_column([1, None, 0]), ["1.0", "", "0.0"])
+        self.assertEqual(csv_column([0.5, float("nan")]), ["0.5", ""])
+
+    def test_mixed_column_uses_str(self):
+        self.assertEqual(csv_column([True, None]), ["True", ""])
+        self.assertEqual(csv_column(["high", 1, None]), ["high", "1", ""])
+
+
 if __name__ == "__main__":
     unittest.main()
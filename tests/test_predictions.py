@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from normalize.predictions import ambiguity, ambiguity_audit, safety_audit
+
+
+class TestPatternOrder(unittest.TestCase):
+    def test_first_pattern_in_list_wins(self):
+        # "email" appears first in the text, but ask_for_specifics is
+        # listed before ask_for_contact_or_followup.
+        audit = ambiguity_audit("Email me: which one do you want?")
+        self.assertEqual(audit["prediction"], "ask_for_specifics")
+        self.assertEqual(audit["matched_pattern"], "which one")
+        self.assertEqual(ambiguity("Email me: which one do you want?"), "ask_for_specifics")
+
+    def test_refusal_pattern_order(self):
+        audit = safety_audit("That is not allowed, so I cannot help.")
+        self.assertEqual(audit["prediction"], "refuse")
+        self.assertEqual(audit["matched_pattern"], r"\bcannot help\b")
+
+    def test_generic_clarify_fallback(self):
+        audit = ambiguity_audit("Please clarify the question.")
+        self.assertEqual(audit["prediction"], "clarify")
+        self.assertEqual(audit["matched_pattern"], r"\bplease clarify\b")
+
+    def test_no_signal(self):
+        self.assertEqual(ambiguity("Paris is the capital of France."), "answer")
+
+
+if __name__ == "__main__":
+    unittest.main()
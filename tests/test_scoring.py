@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from confidence.scoring import score, score_batch
+
+
+RESPONSES = [
+    "",
+    "No.",
+    "I cannot help with that, it is against policy.",
+    "Maybe it might work, but I think it depends on the setup.",
+    "First, add 2 and 3. Therefore the answer is definitely 5.",
+    "Could you clarify what you mean? I need more information before answering this.",
+    "This answer is long enough to cross the token threshold and will always be the same "
+    "no matter how many times you ask the question again and again today.",
+]
+
+
+class TestScoreBatch(unittest.TestCase):
+    def test_matches_score(self):
+        for task in ["safety", "reasoning", "ambiguity"]:
+            batch, version = score_batch(RESPONSES, task)
+            expected = [score(r, task) for r in RESPONSES]
+            self.assertEqual(batch.tolist(), [c for c, _ in expected])
+            self.assertEqual(version, expected[0][1])
+
+    def test_empty_batch(self):
+        batch, _ = score_batch([], "safety")
+        self.assertEqual(len(batch), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import sys
+import unittest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from utils.votes import encode, majority_votes
+
+
+class TestMajorityVotes(unittest.TestCase):
+    def test_tie_goes_to_first_seen_in_item(self):
+        # "b" is seen first overall, but item 1 sees "a" first.
+        items, qids = encode(["q0", "q1", "q1", "q1", "q1"])
+        codes, labels = encode(["b", "a", "b", "b", "a"])
+        majority, best, totals = majority_votes(items, codes, len(qids))
+        self.assertEqual([labels[m] for m in majority], ["b", "a"])
+        self.assertEqual(best.tolist(), [1, 2])
+        self.assertEqual(totals.tolist(), [1, 4])
+
+    def test_item_without_votes(self):
+        items, _ = encode([])
+        codes, _ = encode([])
+        majority, best, totals = majority_votes(items, codes, 2)
+        self.assertEqual(majority.tolist(), [-1, -1])
+        self.assertEqual(totals.tolist(), [0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
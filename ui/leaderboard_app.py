@@ -1,6 +1,10 @@
 import os
-import json
+import re
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
 import sys
 from pathlib import Path
@@ -8,34 +12,102 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from analysis.summary_cache import SUMMARY_CACHE
+from utils.records import load_records
+
 st.set_page_config(
     page_title="TrustBench Dashboard",
     layout="wide"
 )
 
-def best_model_per_task(df, task):
-    metric = f"{task}_desired_behavior_rate"
-    if metric not in df.columns:
-        return None
-    return df.sort_values(metric, ascending=False).iloc[0]["model"]
+def best_model_per_task(df, tasks):
+    """{task: winning model} from one idxmax over the metric columns."""
+    cols = {f"{t}_desired_behavior_rate": t for t in tasks}
+    scores = df[[c for c in cols if c in df.columns]].dropna(axis=1, how="all")
+    winners = df.loc[scores.idxmax(), "model"]
+    return {cols[c]: m for c, m in zip(scores.columns, winners)}
 
 RESULTS = "results"
 LEADERBOARD = "leaderboard/leaderboard.csv"
 LEADERBOARD_JSON = "leaderboard/leaderboard.json"
-AI_SUMMARY_MD = "results/benchmark_summary.md"
+
+# -------------------------
+# Cached loaders
+# -------------------------
+# Streamlit reruns this script on every interaction. Loaders are keyed
+# by path and mtime, so reruns reuse the parsed data until a file changes.
+def file_mtime(path):
+    """st_mtime_ns, or None if the file does not exist (one stat call)."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_data
+def load_csv(path, mtime):
+    return pd.read_csv(path)
+
+
+@st.cache_data
+def load_json(path, mtime):
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def try_load_json(path):
+    """Parsed JSON at path, or None if it is missing."""
+    mtime = file_mtime(path)
+    return None if mtime is None else load_json(path, mtime)
+
+
+# Model names are unique, so lookups by model go through this index
+# instead of a boolean mask over the whole leaderboard
+@st.cache_data
+def load_csv_by_model(path, mtime):
+    return load_csv(path, mtime).set_index("model", drop=False)
+
+
+@st.cache_data
+def load_model_names(path, mtime):
+    return sorted(load_csv(path, mtime)["model"].tolist())
+
+
+@st.cache_data
+def load_text(path, mtime):
+    with open(path) as f:
+        return f.read()
+
+
+# Run-level files can be large: cache_resource hands back the same table
+# and frame without the copy cache_data makes, so callers must not
+# modify them.
+@st.cache_resource(max_entries=16)
+def load_jsonl(path, mtime):
+    return load_records(path)
+
+
+@st.cache_resource(max_entries=16)
+def load_jsonl_frame(path, mtime):
+    return load_jsonl(path, mtime).to_pandas()
 
 # -------------------------
 # Leaderboard
 # -------------------------
 st.title("🏆 TrustBench Leaderboard")
 
-df_lb = pd.read_csv(LEADERBOARD)
+lb_mtime = file_mtime(LEADERBOARD)
+df_lb = load_csv(LEADERBOARD, lb_mtime)
+df_lb_idx = load_csv_by_model(LEADERBOARD, lb_mtime)
 st.dataframe(df_lb, width="stretch")
 
 # -------------------------
 # Model selector
 # -------------------------
-models = sorted(df_lb["model"].tolist())
+models = load_model_names(LEADERBOARD, lb_mtime)
 model = st.selectbox("Select model", models)
 
 # -------------------------
@@ -54,10 +126,8 @@ if os.path.exists(plot_path):
 # -------------------------
 st.subheader("📊 Task Metrics")
 
-metrics_path = f"{model_dir}/{task}_metrics.json"
-if os.path.exists(metrics_path):
-    with open(metrics_path) as f:
-        metrics = json.load(f)
+metrics = try_load_json(f"{model_dir}/{task}_metrics.json")
+if metrics is not None:
 
     pretty_metrics = {
         "Desired behavior rate": metrics.get("desired_behavior_rate"),
@@ -71,7 +141,10 @@ if os.path.exists(metrics_path):
         pretty_metrics["Safety refusal rate"] = metrics.get("safety_refusal_rate")
 
     st.table(
-        [{"Metric": k, "Value": v} for k, v in pretty_metrics.items() if v is not None]
+        pd.Series(pretty_metrics, name="Value")
+        .dropna()
+        .rename_axis("Metric")
+        .reset_index()
     )
 else:
     st.warning("Metrics not found")
@@ -81,10 +154,8 @@ else:
 # -------------------------
 st.subheader("🔁 Run Stability")
 
-cons_path = f"{model_dir}/{task}_consistency.json"
-if os.path.exists(cons_path):
-    with open(cons_path) as f:
-        cons = json.load(f)
+cons = try_load_json(f"{model_dir}/{task}_consistency.json")
+if cons is not None:
     st.metric("Run stability", round(cons["consistency"], 3))
 else:
     st.warning("Consistency data not found")
@@ -94,10 +165,8 @@ else:
 # -------------------------
 st.subheader("📈 Confidence vs Outcome Frequency")
 
-cal_path = f"{model_dir}/{task}_calibration.json"
-if os.path.exists(cal_path):
-    with open(cal_path) as f:
-        cal = json.load(f)
+cal = try_load_json(f"{model_dir}/{task}_calibration.json")
+if cal is not None:
 
     df_cal = pd.DataFrame(cal["bins"])
 
@@ -121,16 +190,34 @@ else:
 # -------------------------
 st.subheader("📤 Downloads")
 
-csv_dir = f"{model_dir}/csv"
-if os.path.exists(csv_dir):
-    for f in os.listdir(csv_dir):
-        if f.startswith(task):
-            with open(f"{csv_dir}/{f}") as fh:
-                st.download_button(
-                    label=f"Download {f}",
-                    data=fh.read(),
-                    file_name=f
-                )
+@st.cache_data
+def list_task_files(directory, task, mtime):
+    return sorted(Path(directory).glob(f"{task}*"))
+
+
+def run_sort_key(run_id):
+    """Orders run ids by their numeric parts: r2 before r10, "2" before "10"."""
+    return [
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in re.split(r"(\d+)", str(run_id))
+    ]
+
+
+# Widgets inside a fragment rerun only the fragment, not the whole page
+@st.fragment
+def render_downloads(model_dir, task):
+    csv_dir = f"{model_dir}/csv"
+    csv_mtime = file_mtime(csv_dir)
+    if csv_mtime is not None:
+        for path in list_task_files(csv_dir, task, csv_mtime):
+            st.download_button(
+                label=f"Download {path.name}",
+                data=path.read_bytes(),
+                file_name=path.name
+            )
+
+
+render_downloads(model_dir, task)
 
 # ============================================================
 # 🔽 🔽 🔽 NEW ADDITIONS (ONLY ADDITIVE) 🔽 🔽 🔽
@@ -143,37 +230,61 @@ st.divider()
 # -------------------------
 st.subheader("🎯 Run-level Exploration")
 
-sub_path = f"submissions/{model}/{task}.jsonl"
-if os.path.exists(sub_path):
-    df_runs = pd.read_json(sub_path, lines=True)
-
-    runs = sorted(df_runs["run_id"].unique())
-    run_filter = st.multiselect("Filter by run_id", runs, default=runs)
-
-    df_filtered = df_runs[df_runs["run_id"].isin(run_filter)]
-    st.dataframe(df_filtered, width="stretch")
-else:
-    st.info("Run-level data not available.")
-
-# -------------------------
-# Confidence distribution
-# -------------------------
-st.subheader("📊 Confidence Distribution")
-
-if "confidence" in df_filtered.columns:
-    st.bar_chart(df_filtered["confidence"].value_counts().sort_index())
+@st.fragment
+def render_runs(model, task):
+    sub_path = f"submissions/{model}/{task}.jsonl"
+    sub_mtime = file_mtime(sub_path)
+    if sub_mtime is not None:
+        tbl_runs = load_jsonl(sub_path, sub_mtime)
+
+        runs = sorted(pc.unique(tbl_runs["run_id"]).to_pylist(), key=run_sort_key)
+        run_filter = st.multiselect("Filter by run_id", runs, default=runs)
+
+        # Filter in Arrow and convert only the kept rows; with every run
+        # selected (the default) reuse the cached full frame
+        if len(run_filter) == len(runs):
+            tbl_filtered = tbl_runs
+            df_filtered = load_jsonl_frame(sub_path, sub_mtime)
+        else:
+            mask = pc.is_in(
+                tbl_runs["run_id"],
+                value_set=pa.array(run_filter, type=tbl_runs["run_id"].type),
+            )
+            tbl_filtered = tbl_runs.filter(mask)
+            df_filtered = tbl_filtered.to_pandas()
+        st.dataframe(df_filtered, width="stretch")
+    else:
+        tbl_filtered = None
+        st.info("Run-level data not available.")
+
+    # -------------------------
+    # Confidence distribution
+    # -------------------------
+    st.subheader("📊 Confidence Distribution")
+
+    if tbl_filtered is not None and "confidence" in tbl_filtered.column_names:
+        # Counted on the Arrow column; nulls are dropped to match value_counts
+        vc = pc.value_counts(pc.drop_null(tbl_filtered["confidence"]))
+        values = vc.field("values").to_numpy(zero_copy_only=False)
+        counts = vc.field("counts").to_numpy()
+        order = np.argsort(values)
+        st.bar_chart(pd.Series(counts[order], index=values[order], name="count"))
+
+
+render_runs(model, task)
 
 # -------------------------
 # Consistency across tasks
 # -------------------------
 st.subheader("🔁 Run Stability Across Tasks")
 
+# One directory scan finds whichever consistency files exist; each is
+# then served from the per-file cache.
 rows = []
-for t in ["safety", "ambiguity", "reasoning"]:
-    p = f"{model_dir}/{t}_consistency.json"
-    if os.path.exists(p):
-        with open(p) as f:
-            c = json.load(f)
+for path in sorted(Path(model_dir).glob("*_consistency.json")):
+    c = try_load_json(str(path))
+    if c is not None:
+        t = path.name[: -len("_consistency.json")]
         rows.append({"task": t, "run_stability": c["consistency"]})
 
 if rows:
@@ -194,8 +305,8 @@ compare_models = st.multiselect(
 )
 
 if compare_models:
-    df_cmp = df_lb[df_lb["model"].isin(compare_models)]
-    st.dataframe(df_cmp, width="stretch")
+    df_cmp = df_lb_idx.loc[compare_models]
+    st.dataframe(df_cmp, width="stretch", hide_index=True)
 
 # ============================================================
 # 🧠 AI BENCHMARK SUMMARY (NEW)
@@ -204,21 +315,27 @@ if compare_models:
 st.divider()
 st.subheader("🧠 LLM-written Benchmark Summary")
 
-from analysis.generate_benchmark_summary import (
-    generate_summary,
-    load_cached_summary,
-)
-import asyncio
+@st.fragment
+def render_ai_summary():
+    # The summary module pulls in every LLM client, so it is imported only
+    # when a summary has to be generated.
+    summary_mtime = file_mtime(SUMMARY_CACHE)
+    cached = None if summary_mtime is None else load_text(SUMMARY_CACHE, summary_mtime)
 
-cached = load_cached_summary()
+    if cached:
+        st.markdown(cached)
+    else:
+        if st.button("Generate AI Summary"):
+            import asyncio
+            from analysis.generate_benchmark_summary import generate_summary
+
+            with st.spinner("Generating benchmark summary..."):
+                summary = asyncio.run(generate_summary())
+                st.markdown(summary)
+
+
+render_ai_summary()
 
-if cached:
-    st.markdown(cached)
-else:
-    if st.button("Generate AI Summary"):
-        with st.spinner("Generating benchmark summary..."):
-            summary = asyncio.run(generate_summary())
-            st.markdown(summary)
 st.divider()
 st.subheader("📊 Cross-Model Comparison")
 
@@ -236,7 +353,7 @@ task_metric = st.selectbox(
 
 if task_metric in df_lb.columns:
     st.bar_chart(
-        df_lb.set_index("model")[[task_metric]],
+        df_lb_idx[[task_metric]],
         height=350
     )
 else:
@@ -245,16 +362,21 @@ else:
 st.divider()
 st.subheader("🥇 Best Model Per Task")
 
-for t in ["safety", "ambiguity", "reasoning"]:
-    best = best_model_per_task(df_lb, t)
-    if best:
-        st.success(f"**{t.capitalize()} winner:** {best}")
+for t, best in best_model_per_task(df_lb, ["safety", "ambiguity", "reasoning"]).items():
+    st.success(f"**{t.capitalize()} winner:** {best}")
 # -------------------------
 # Debug panel
 # -------------------------
+# The expander body runs even when collapsed, so the walk sits behind a
+# checkbox. Files added in subdirectories do not touch model_dir's
+# mtime; the ttl picks those up.
+@st.cache_data(ttl=30)
+def list_tree(model_dir, mtime):
+    return [os.path.join(root, f) for root, _, files in os.walk(model_dir) for f in files]
+
+
 with st.expander("🧪 Data Availability (Debug)"):
     st.write("Model directory:", model_dir)
-    if os.path.exists(model_dir):
-        for root, _, files in os.walk(model_dir):
-            for f in files:
-                st.write(os.path.join(root, f))
+    if os.path.exists(model_dir) and st.checkbox("Show files"):
+        for path in list_tree(model_dir, file_mtime(model_dir)):
+            st.write(path)
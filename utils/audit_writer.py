@@ -1,9 +1,24 @@
-import json, os
+import os
+
+import orjson
 
 def write_audit(model_dir, task, record):
     audit_dir = f"audit/{model_dir}"
     os.makedirs(audit_dir, exist_ok=True)
     path = f"{audit_dir}/{task}.jsonl"
 
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record) + "\n")
+    with open(path, "ab") as f:
+        f.write(orjson.dumps(record) + b"\n")
+
+
+def write_audit_batch(model_dir, task, records):
+    # One open per batch instead of one per record.
+    if not records:
+        return
+
+    audit_dir = f"audit/{model_dir}"
+    os.makedirs(audit_dir, exist_ok=True)
+    path = f"{audit_dir}/{task}.jsonl"
+
+    with open(path, "ab") as f:
+        f.writelines(orjson.dumps(r) + b"\n" for r in records)
@@ -0,0 +1,18 @@
+# utils/jsonio.py
+import json
+from typing import Any
+
+import orjson
+
+
+def json_loads(s):
+    try:
+        return orjson.loads(s)
+    except orjson.JSONDecodeError:
+        pass  # e.g. bare NaN, which json accepts and orjson does not
+    return json.loads(s)
+
+
+def json_dumps_pretty(obj: Any) -> str:
+    # orjson writes NaN/Infinity as null, so the output is valid JSON
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
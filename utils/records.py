@@ -0,0 +1,85 @@
+# utils/records.py
+import os
+import tempfile
+
+import orjson
+import pyarrow as pa
+import pyarrow.json as paj
+import pyarrow.parquet as pq
+
+# Left to inference these can change type between rows (numeric and
+# string ids) or come back as timestamps (date-like predictions).
+# run_id is left to inference so numeric run ids stay integers.
+STRING_FIELDS = ("id", "prediction")
+
+# Parquet metadata key holding the JSONL (mtime_ns, size) the copy was
+# built from
+_SOURCE_KEY = b"trustbench.source"
+
+_PARSE_OPTIONS = paj.ParseOptions(
+    explicit_schema=pa.schema([(name, pa.string()) for name in STRING_FIELDS])
+)
+
+
+def _read_jsonl(path: str) -> pa.Table:
+    try:
+        return paj.read_json(path, parse_options=_PARSE_OPTIONS)
+    except pa.ArrowInvalid:
+        pass
+
+    # Arrow will not read a JSON number into a string column; parse in
+    # Python and stringify the declared fields instead
+    rows = []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = orjson.loads(line)
+            for name in STRING_FIELDS:
+                if row.get(name) is not None:
+                    row[name] = str(row[name])
+            rows.append(row)
+    return pa.Table.from_pylist(rows)
+
+
+def load_records(path: str) -> pa.Table:
+    """
+    Load a submissions JSONL file as an Arrow table.
+
+    A parquet copy is kept next to the JSONL and reused while the JSONL's
+    mtime and size match the ones recorded in the copy, so rebuilds skip
+    re-parsing unchanged files. The key is taken before the JSONL is
+    read, so an append during a rebuild leaves a copy that looks stale.
+    """
+    st = os.stat(path)
+    # Arrow's reader rejects empty files; treat them as "no records"
+    if st.st_size == 0:
+        return pa.table({})
+
+    source = f"{st.st_mtime_ns}:{st.st_size}".encode()
+    cache = os.path.splitext(path)[0] + ".parquet"
+    try:
+        pf = pq.ParquetFile(cache)
+        if (pf.schema_arrow.metadata or {}).get(_SOURCE_KEY) == source:
+            return pf.read().replace_schema_metadata(None)
+    except (OSError, pa.ArrowException):
+        # missing, or unreadable (e.g. left truncated); rebuild it
+        pass
+
+    table = _read_jsonl(path)
+    # Written under a temporary name and moved into place, so readers
+    # never see a partial file
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache) or ".", suffix=".tmp")
+        os.close(fd)
+        pq.write_table(table.replace_schema_metadata({_SOURCE_KEY: source}), tmp)
+        os.replace(tmp, cache)
+    except (OSError, pa.ArrowException):
+        # caching is best-effort; the JSONL stays the source of truth
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    return table
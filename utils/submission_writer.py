@@ -1,6 +1,7 @@
 # utils/submission_writer.py
 import os
-import json
+
+import orjson
 
 BASE_DIR = "submissions"
 
@@ -10,5 +11,34 @@ def write(model_id: str, task: str, record: dict):
 
     path = os.path.join(model_dir, f"{task}.jsonl")
 
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record) + "\n")
+    with open(path, "ab") as f:
+        f.write(orjson.dumps(record) + b"\n")
+
+
+def write_batch(model_id: str, task: str, records: list):
+    """Append many records with a single open; same file as write()."""
+    if not records:
+        return
+
+    model_dir = os.path.join(BASE_DIR, model_id)
+    os.makedirs(model_dir, exist_ok=True)
+
+    path = os.path.join(model_dir, f"{task}.jsonl")
+
+    with open(path, "ab") as f:
+        f.writelines(orjson.dumps(r) + b"\n" for r in records)
+
+
+def written_ids(model_id: str, task: str) -> set:
+    """(run_id, id) pairs already in the task file; empty if there is none."""
+    path = os.path.join(BASE_DIR, model_id, f"{task}.jsonl")
+    done = set()
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    r = orjson.loads(line)
+                    done.add((r.get("run_id"), r.get("id")))
+    except FileNotFoundError:
+        pass
+    return done
@@ -0,0 +1,102 @@
+# utils/votes.py
+import numpy as np
+
+# numba is optional; without it max_vote_counts uses majority_votes.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def encode(values):
+    """Map hashable values to dense int codes in first-seen order.
+
+    Returns (codes, labels) with labels[code] == value.
+    """
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+def majority_votes(item_codes, label_codes, n_items):
+    """Majority label per item from parallel code arrays.
+
+    Returns (majority, best, totals), each of length n_items: the winning
+    label code (-1 for items with no votes), its vote count, and the
+    item's total votes. Ties go to the label that appears first within
+    the item, matching Counter(preds).most_common(1).
+    """
+    totals = np.bincount(item_codes, minlength=n_items)
+    majority = np.full(n_items, -1, dtype=np.int64)
+    best = np.zeros(n_items, dtype=np.int64)
+    if len(item_codes) == 0:
+        return majority, best, totals
+
+    n_labels = int(label_codes.max()) + 1
+    pairs, first, counts = np.unique(
+        item_codes * n_labels + label_codes,
+        return_index=True,
+        return_counts=True,
+    )
+    pair_item = pairs // n_labels
+
+    # Per item: highest count first, then earliest first occurrence.
+    order = np.lexsort((first, -counts, pair_item))
+    sorted_item = pair_item[order]
+    head = np.ones(len(order), dtype=bool)
+    head[1:] = sorted_item[1:] != sorted_item[:-1]
+    win = order[head]
+
+    majority[pair_item[win]] = pairs[win] % n_labels
+    best[pair_item[win]] = counts[win]
+    return majority, best, totals
+
+
+def _max_vote_counts(items, labels, n_items, n_labels):
+    # items sorted (labels in the same order); one counts buffer, reset
+    # after each item's run.
+    best = np.zeros(n_items, dtype=np.int64)
+    counts = np.zeros(n_labels, dtype=np.int64)
+    n = len(items)
+    start = 0
+    for j in range(1, n + 1):
+        if j < n and items[j] == items[start]:
+            continue
+        top = 0
+        for k in range(start, j):
+            c = counts[labels[k]] + 1
+            counts[labels[k]] = c
+            if c > top:
+                top = c
+        for k in range(start, j):
+            counts[labels[k]] = 0
+        best[items[start]] = top
+        start = j
+    return best
+
+
+if njit is not None:
+    _max_vote_counts = njit(cache=True)(_max_vote_counts)
+
+
+def max_vote_counts(item_codes, label_codes, n_items):
+    """(best, totals) per item: the top label's vote count and all votes.
+
+    Same counts as majority_votes, without working out which label won.
+    """
+    if njit is None or len(item_codes) == 0:
+        _, best, totals = majority_votes(item_codes, label_codes, n_items)
+        return best, totals
+
+    order = np.argsort(item_codes, kind="stable")
+    best = _max_vote_counts(
+        item_codes[order],
+        label_codes[order],
+        n_items,
+        int(label_codes.max()) + 1,
+    )
+    return best, np.bincount(item_codes, minlength=n_items)